@@ -1,12 +1,18 @@
+from django.conf import settings
 from django.contrib import admin
 
-# Register your models here.
-
 from .models import BooksBook, BooksAuthor, BooksLanguage, BooksSubject, BooksBookshelf, BooksFormat
 
-admin.site.register(BooksBook)
-admin.site.register(BooksAuthor)
-admin.site.register(BooksLanguage)
-admin.site.register(BooksSubject)
-admin.site.register(BooksBookshelf)
-admin.site.register(BooksFormat)
+
+class GutenbergAdmin(admin.ModelAdmin):
+    """Admin defaults tuned for the large read-mostly catalog tables"""
+    list_per_page = 50
+    # Skip the full-table COUNT(*) on every changelist page
+    show_full_result_count = False
+
+
+# API-only deployments can set DISABLE_ADMIN=True to skip registration
+# and the ModelAdmin construction it triggers at startup
+if not settings.DISABLE_ADMIN:
+    for model in (BooksBook, BooksAuthor, BooksLanguage, BooksSubject, BooksBookshelf, BooksFormat):
+        admin.site.register(model, GutenbergAdmin)
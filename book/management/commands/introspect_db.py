@@ -1,27 +1,38 @@
+import hashlib
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+
 import psycopg2
 from django.core.management.base import BaseCommand
 from django.conf import settings
 
-# SQL type to Django field type mapping
+# Postgres type OID to (Django field class, base kwargs) mapping; '{}'
+# in the kwargs template is filled with the column's character length.
+# Integer keys dispatch on pg_attribute.atttypid instead of repeated
+# string comparisons against information_schema type names.
 type_mapping = {
-    'integer': 'models.IntegerField()',
-    'bigint': 'models.BigIntegerField()',
-    'smallint': 'models.SmallIntegerField()',
-    'varchar': 'models.CharField(max_length={})',
-    'text': 'models.TextField()',
-    'boolean': 'models.BooleanField()',
-    'date': 'models.DateField()',
-    'time': 'models.TimeField()',
-    'timestamp': 'models.DateTimeField()',
-    'timestamptz': 'models.DateTimeField()',
-    'double precision': 'models.FloatField()',
-    'real': 'models.FloatField()',
-    'numeric': 'models.DecimalField(max_digits=19, decimal_places=10)',
-    'uuid': 'models.UUIDField()',
-    'json': 'models.JSONField()',
-    'jsonb': 'models.JSONField()',
+    23: ('IntegerField', ''),       # int4
+    20: ('BigIntegerField', ''),    # int8
+    21: ('SmallIntegerField', ''),  # int2
+    1043: ('CharField', 'max_length={}'),  # varchar
+    25: ('TextField', ''),          # text
+    16: ('BooleanField', ''),       # bool
+    1082: ('DateField', ''),        # date
+    1083: ('TimeField', ''),        # time
+    1114: ('DateTimeField', ''),    # timestamp
+    1184: ('DateTimeField', ''),    # timestamptz
+    701: ('FloatField', ''),        # float8 (double precision)
+    700: ('FloatField', ''),        # float4 (real)
+    1700: ('DecimalField', 'max_digits=19, decimal_places=10'),  # numeric
+    2950: ('UUIDField', ''),        # uuid
+    114: ('JSONField', ''),         # json
+    3802: ('JSONField', ''),        # jsonb
 }
 
+BOOLEAN_OID = 16
+NUMERIC_OIDS = frozenset({20, 21, 23, 700, 701, 1700})
+
 class Command(BaseCommand):
     help = 'Introspect database and generate Django models for Project Gutenberg tables'
 
@@ -42,120 +53,131 @@ class Command(BaseCommand):
         components = snake_str.split('_')
         return ''.join(x.title() for x in components)
 
-    def get_django_field(self, col_name, data_type, char_length, is_nullable, is_primary_key, default):
+    def get_schema_columns(self, conn, prefix):
+        """
+        Fetch column and primary key details for every table matching the
+        prefix in a single query, ordered by (table_name, ordinal_position).
+        """
+        # Named (server-side) cursor so rows stream back in batches rather
+        # than being buffered by the client in one fetchall
+        cursor = conn.cursor(name='introspect_columns')
+        cursor.itersize = 2000
+        # pg_catalog is much cheaper to scan than the information_schema
+        # views and exposes the type OIDs the field mapping dispatches on
+        cursor.execute("""
+            SELECT
+                c.relname AS table_name,
+                a.attname AS column_name,
+                a.atttypid::int AS type_oid,
+                CASE WHEN a.atttypid = 1043 AND a.atttypmod > 0
+                     THEN a.atttypmod - 4 END AS char_length,
+                CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable,
+                pg_get_expr(d.adbin, d.adrelid) AS column_default,
+                CASE WHEN i.indisprimary THEN 'YES' ELSE 'NO' END AS is_primary_key
+            FROM pg_catalog.pg_attribute a
+            JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_catalog.pg_attrdef d
+                ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+            LEFT JOIN pg_catalog.pg_index i
+                ON i.indrelid = a.attrelid
+                AND a.attnum = ANY(i.indkey)
+                AND i.indisprimary
+            WHERE n.nspname = 'public'
+            AND c.relkind = 'r'
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+            AND c.relname LIKE %s
+            ORDER BY c.relname, a.attnum
+        """, (prefix + '%',))
+        rows = [row for row in cursor]
+        cursor.close()
+        return rows
+
+    def get_schema_hash(self, schema_columns):
+        """Compute a cheap fingerprint of the schema column rows"""
+        digest = hashlib.blake2b()
+        for row in schema_columns:
+            digest.update(repr(row).encode())
+        return digest.hexdigest()
+
+    @lru_cache(maxsize=None)
+    def get_django_field(self, col_name, type_oid, char_length, is_nullable, is_primary_key, default):
         """Convert PostgreSQL column details to Django model field"""
-        django_field = None
-        
         # Handle primary key
         if is_primary_key:
-            return f"models.AutoField(primary_key=True)"
-        
-        # Map data types
-        if data_type in type_mapping:
-            django_field = type_mapping[data_type]
-            if data_type == 'varchar':
-                django_field = django_field.format(char_length)
-        else:
-            django_field = "models.TextField()"  # Default for unknown types
-        
+            return "models.AutoField(primary_key=True)"
+
+        # Map type OIDs; unknown types fall back to TextField
+        field_class, base_kwargs = type_mapping.get(type_oid, ('TextField', ''))
+
+        kwargs = []
+        if base_kwargs:
+            kwargs.append(base_kwargs.format(char_length))
+
         # Add null=True for nullable fields
-        if is_nullable == 'YES' and not is_primary_key:
-            django_field = django_field.replace(')', ', null=True)')
-        
+        if is_nullable == 'YES':
+            kwargs.append('null=True')
+
         # Add default if specified
-        if default and default not in ('NULL', None) and not is_primary_key:
+        if default and default not in ('NULL', None):
             # Handle boolean defaults
-            if data_type == 'boolean':
-                if default.lower() in ('true', 't', 'yes', 'y', '1'):
-                    default_val = 'True'
-                else:
-                    default_val = 'False'
-                django_field = django_field.replace(')', f', default={default_val})')
+            if type_oid == BOOLEAN_OID:
+                default_val = default.lower() in ('true', 't', 'yes', 'y', '1')
+                kwargs.append(f'default={default_val}')
             # Handle numeric defaults
-            elif data_type in ('integer', 'bigint', 'smallint', 'double precision', 'real', 'numeric'):
-                django_field = django_field.replace(')', f', default={default})')
+            elif type_oid in NUMERIC_OIDS:
+                kwargs.append(f'default={default}')
             # Handle string defaults
             else:
-                django_field = django_field.replace(')', f", default='{default}')")
-        
-        return django_field
+                kwargs.append(f"default='{default}'")
 
-    def generate_models(self, conn, prefix):
-        cursor = conn.cursor()
-        
-        # Get list of tables that start with the specified prefix
-        cursor.execute(f"""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_name LIKE '{prefix}%'
-        """)
-        
-        tables = cursor.fetchall()
-        
-        if not tables:
+        return f"models.{field_class}({', '.join(kwargs)})"
+
+    def generate_models(self, schema_columns, prefix):
+        if not schema_columns:
             self.stdout.write(self.style.WARNING(f"No tables starting with '{prefix}' found in the database."))
             return None
-        
-        models_code = "from django.db import models\n\n"
-        
-        for table in tables:
-            table_name = table[0]
+
+        # Collect chunks in a list and join once at the end; repeated +=
+        # on a string is quadratic for large schemas
+        parts = ["from django.db import models\n\n"]
+
+        # Rows arrive ordered by (table_name, ordinal_position), so one
+        # groupby pass yields the columns for each table in turn
+        for table_name, table_rows in groupby(schema_columns, key=itemgetter(0)):
             class_name = self.snake_to_camel_case(table_name)
-            
-            # Get column information
-            cursor.execute("""
-                SELECT 
-                    c.column_name,
-                    c.data_type,
-                    c.character_maximum_length,
-                    c.is_nullable,
-                    c.column_default,
-                    CASE WHEN pk.constraint_name IS NOT NULL THEN 'YES' ELSE 'NO' END AS is_primary_key
-                FROM information_schema.columns c
-                LEFT JOIN (
-                    SELECT ku.table_schema, ku.table_name, ku.column_name, tc.constraint_name
-                    FROM information_schema.table_constraints tc
-                    JOIN information_schema.key_column_usage ku ON tc.constraint_name = ku.constraint_name
-                    WHERE tc.constraint_type = 'PRIMARY KEY'
-                ) pk 
-                ON c.table_schema = pk.table_schema 
-                AND c.table_name = pk.table_name 
-                AND c.column_name = pk.column_name
-                WHERE c.table_name = %s
-                AND c.table_schema = 'public'
-                ORDER BY c.ordinal_position
-            """, (table_name,))
-            
-            columns = cursor.fetchall()
-            
+            columns = [row[1:] for row in table_rows]
+
             # Create class header with docstring
-            models_code += f"class {class_name}(models.Model):\n"
-            models_code += f'    """\n'
-            models_code += f'    Model for {table_name} table from Project Gutenberg database.\n'
-            models_code += f'    """\n'
-            
+            parts.append(f"class {class_name}(models.Model):\n")
+            parts.append(f'    """\n')
+            parts.append(f'    Model for {table_name} table from Project Gutenberg database.\n')
+            parts.append(f'    """\n')
+
             for col in columns:
                 col_name = col[0]
-                data_type = col[1]
+                type_oid = col[1]
                 char_length = col[2]
                 is_nullable = col[3]
                 default = col[4]
                 is_primary_key = col[5]
-                
-                field = self.get_django_field(col_name, data_type, char_length, is_nullable, is_primary_key == 'YES', default)
-                models_code += f"    {col_name} = {field}\n"
-            
-            models_code += f"\n    class Meta:\n        db_table = '{table_name}'\n\n"
-            # Add __str__ method for readability
-            if any(col[0] in ('name', 'title') for col in columns):
-                str_field = next((col[0] for col in columns if col[0] in ('name', 'title')), None)
-                if str_field:
-                    models_code += f"    def __str__(self):\n"
-                    models_code += f"        return self.{str_field} or f\"{class_name} {{{self.id}}}\"\n\n"
-        
-        cursor.close()
-        return models_code
+
+                field = self.get_django_field(col_name, type_oid, char_length, is_nullable, is_primary_key == 'YES', default)
+                parts.append(f"    {col_name} = {field}\n")
+
+            parts.append(f"\n    class Meta:\n        db_table = '{table_name}'\n\n")
+            # Add __str__ method for readability; one scan over the columns
+            str_field = next((col[0] for col in columns if col[0] in {'name', 'title'}), None)
+            if str_field:
+                parts.append("    def __str__(self):\n")
+                parts.append(
+                    '        return self.{f} or f"{cls} {{self.id}}"\n\n'.format(
+                        f=str_field, cls=class_name
+                    )
+                )
+
+        return "".join(parts)
 
     def handle(self, *args, **options):
         output_file = options['output']
@@ -176,14 +198,33 @@ class Command(BaseCommand):
             )
             
             self.stdout.write(self.style.SUCCESS('Successfully connected to the database.'))
-            
-            # Generate models
-            models_code = self.generate_models(conn, table_prefix)
-            
+
+            # Fingerprint the schema and skip regeneration when unchanged
+            schema_columns = self.get_schema_columns(conn, table_prefix)
+            schema_hash = self.get_schema_hash(schema_columns)
+            hash_file = output_file + '.schema_hash'
+            try:
+                with open(hash_file) as f:
+                    previous_hash = f.read().strip()
+            except FileNotFoundError:
+                previous_hash = None
+
+            if previous_hash == schema_hash:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Schema unchanged, {output_file} is up to date.'
+                ))
+                conn.close()
+                return
+
+            # Generate models from the already-fetched column rows
+            models_code = self.generate_models(schema_columns, table_prefix)
+
             if models_code:
                 # Write to models.py
                 with open(output_file, 'w') as f:
                     f.write(models_code)
+                with open(hash_file, 'w') as f:
+                    f.write(schema_hash)
                 self.stdout.write(self.style.SUCCESS(f'Django models have been generated in {output_file}'))
             else:
                 self.stdout.write(self.style.WARNING('No models were generated'))
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# The books_* tables pre-exist in the Project Gutenberg database (the app
+# has no table-creating migrations), so the indexes are created with raw
+# SQL guarded by IF NOT EXISTS rather than AddIndex operations.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = []
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS books_book_dl_count_idx
+                    ON books_book (download_count DESC);
+                CREATE INDEX IF NOT EXISTS books_book_gutenberg_idx
+                    ON books_book (gutenberg_id);
+                CREATE INDEX IF NOT EXISTS books_format_mime_type_idx
+                    ON books_format (mime_type);
+                CREATE INDEX IF NOT EXISTS books_book_title_trgm
+                    ON books_book USING gin (title gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS books_author_name_trgm
+                    ON books_author USING gin (name gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS books_subject_name_trgm
+                    ON books_subject USING gin (name gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS books_bookshelf_name_trgm
+                    ON books_bookshelf USING gin (name gin_trgm_ops);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS books_book_dl_count_idx;
+                DROP INDEX IF EXISTS books_book_gutenberg_idx;
+                DROP INDEX IF EXISTS books_format_mime_type_idx;
+                DROP INDEX IF EXISTS books_book_title_trgm;
+                DROP INDEX IF EXISTS books_author_name_trgm;
+                DROP INDEX IF EXISTS books_subject_name_trgm;
+                DROP INDEX IF EXISTS books_bookshelf_name_trgm;
+            """,
+        ),
+    ]
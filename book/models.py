@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 
 class BooksAuthor(models.Model):
     """
@@ -12,7 +13,10 @@ class BooksAuthor(models.Model):
 
     class Meta:
         db_table = 'books_author'
-        
+        indexes = [
+            GinIndex(fields=['name'], name='books_author_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -35,7 +39,12 @@ class BooksBook(models.Model):
 
     class Meta:
         db_table = 'books_book'
-        
+        indexes = [
+            models.Index(fields=['-download_count'], name='books_book_dl_count_idx'),
+            models.Index(fields=['gutenberg_id'], name='books_book_gutenberg_idx'),
+            GinIndex(fields=['title'], name='books_book_title_trgm', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return self.title or f"Book {self.id}"
 
@@ -97,7 +106,10 @@ class BooksBookshelf(models.Model):
 
     class Meta:
         db_table = 'books_bookshelf'
-        
+        indexes = [
+            GinIndex(fields=['name'], name='books_bookshelf_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -113,6 +125,9 @@ class BooksFormat(models.Model):
 
     class Meta:
         db_table = 'books_format'
+        indexes = [
+            models.Index(fields=['mime_type'], name='books_format_mime_type_idx'),
+        ]
 
 class BooksLanguage(models.Model):
     """
@@ -138,7 +153,10 @@ class BooksSubject(models.Model):
 
     class Meta:
         db_table = 'books_subject'
-        
+        indexes = [
+            GinIndex(fields=['name'], name='books_subject_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -41,4 +41,7 @@ class BookSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'gutenberg_id', 'download_count',
             'authors', 'languages', 'subjects', 'bookshelves', 'formats'
-        ] 
\ No newline at end of file
+        ]
+        # The API is read-only; this keeps DRF from building validators
+        # for the model fields when the serializer class is constructed
+        read_only_fields = fields
\ No newline at end of file
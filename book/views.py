@@ -1,30 +1,306 @@
+import hashlib
+import json
 import logging
+import re
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.core.paginator import Page
+from django.db.models import Count, Exists, OuterRef, Prefetch, Window
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
-from .models import BooksBook
+from .models import (
+    BooksBook, BooksAuthor, BooksLanguage, BooksSubject, BooksBookshelf,
+    BooksFormat, BooksBookAuthors, BooksBookLanguages, BooksBookSubjects,
+    BooksBookBookshelves,
+)
 from .serializers import BookSerializer
 
 # Set up logger
 logger = logging.getLogger('book.views')
 
+# Seconds to cache list responses; the catalog is read-only so a short
+# TTL is the only invalidation needed
+BOOK_LIST_CACHE_TTL = 300
+
+def book_list_cache_key(query_params):
+    """Build a cache key from the normalized, sorted query parameters"""
+    normalized = json.dumps(sorted(query_params.items()))
+    return 'books:' + hashlib.blake2b(normalized.encode()).hexdigest()
+
+def parse_csv_param(value, caster=str):
+    """Split a comma-separated query param into cleaned, cast tokens"""
+    tokens = []
+    for token in value.split(','):
+        token = token.strip()
+        if not token:
+            continue
+        try:
+            tokens.append(caster(token))
+        except (TypeError, ValueError):
+            continue
+    return tokens
+
+def filter_by_gutenberg_id(queryset, ids):
+    return queryset.filter(gutenberg_id__in=ids)
+
+def filter_by_language(queryset, language_codes):
+    return queryset.filter(Exists(
+        BooksBookLanguages.objects.filter(
+            book=OuterRef('pk'), language__code__in=language_codes
+        )
+    ))
+
+def filter_by_topic(queryset, topic_list):
+    # One regex alternation means one index probe per relation instead
+    # of one ILIKE per term
+    pattern = '|'.join(map(re.escape, topic_list))
+    return queryset.filter(
+        Exists(BooksBookSubjects.objects.filter(
+            book=OuterRef('pk'), subject__name__iregex=pattern
+        )) |
+        Exists(BooksBookBookshelves.objects.filter(
+            book=OuterRef('pk'), bookshelf__name__iregex=pattern
+        ))
+    )
+
+def filter_by_mime_type(queryset, mime_type_list):
+    return queryset.filter(Exists(
+        BooksFormat.objects.filter(
+            book=OuterRef('pk'), mime_type__in=mime_type_list
+        )
+    ))
+
+def filter_by_author(queryset, author_list):
+    pattern = '|'.join(map(re.escape, author_list))
+    return queryset.filter(Exists(
+        BooksBookAuthors.objects.filter(
+            book=OuterRef('pk'), author__name__iregex=pattern
+        )
+    ))
+
+def filter_by_title(queryset, title_list):
+    pattern = '|'.join(map(re.escape, title_list))
+    return queryset.filter(title__iregex=pattern)
+
+# Prefetches shared by the list and detail endpoints, restricted to the
+# columns the serializers actually read from each related table
+BOOK_PREFETCHES = (
+    Prefetch('authors', queryset=BooksAuthor.objects.only('id', 'name', 'birth_year', 'death_year')),
+    Prefetch('languages', queryset=BooksLanguage.objects.only('id', 'code')),
+    Prefetch('subjects', queryset=BooksSubject.objects.only('id', 'name')),
+    Prefetch('bookshelves', queryset=BooksBookshelf.objects.only('id', 'name')),
+    Prefetch('booksformat_set', queryset=BooksFormat.objects.only('id', 'mime_type', 'url', 'book_id')),
+)
+
+def build_book_payload(rows):
+    """
+    Assemble the nested book dicts for a page of values() rows. Related
+    rows are fetched with one values_list query per relation and grouped
+    in Python, skipping model instantiation and DRF field binding.
+    """
+    books = {}
+    for row in rows:
+        books[row['id']] = {
+            'id': row['id'],
+            'title': row['title'],
+            'gutenberg_id': row['gutenberg_id'],
+            'download_count': row['download_count'],
+            'authors': [],
+            'languages': [],
+            'subjects': [],
+            'bookshelves': [],
+            'formats': [],
+        }
+    if not books:
+        return []
+    ids = list(books)
+
+    author_rows = BooksBookAuthors.objects.filter(book_id__in=ids).values_list(
+        'book_id', 'author__name', 'author__birth_year', 'author__death_year'
+    )
+    for book_id, name, birth_year, death_year in author_rows:
+        books[book_id]['authors'].append({
+            'name': name, 'birth_year': birth_year, 'death_year': death_year
+        })
+
+    language_rows = BooksBookLanguages.objects.filter(book_id__in=ids).values_list(
+        'book_id', 'language__code'
+    )
+    for book_id, code in language_rows:
+        books[book_id]['languages'].append({'code': code})
+
+    subject_rows = BooksBookSubjects.objects.filter(book_id__in=ids).values_list(
+        'book_id', 'subject__name'
+    )
+    for book_id, name in subject_rows:
+        books[book_id]['subjects'].append({'name': name})
+
+    bookshelf_rows = BooksBookBookshelves.objects.filter(book_id__in=ids).values_list(
+        'book_id', 'bookshelf__name'
+    )
+    for book_id, name in bookshelf_rows:
+        books[book_id]['bookshelves'].append({'name': name})
+
+    format_rows = BooksFormat.objects.filter(book_id__in=ids).values_list(
+        'book_id', 'mime_type', 'url'
+    )
+    for book_id, mime_type, url in format_rows:
+        books[book_id]['formats'].append({'mime_type': mime_type, 'url': url})
+
+    return list(books.values())
+
+# (query param, token caster, filter function) for each list filter
+FILTER_SPECS = [
+    ('gutenberg_id', int, filter_by_gutenberg_id),
+    ('language', str.lower, filter_by_language),
+    ('topic', str, filter_by_topic),
+    ('mime_type', str, filter_by_mime_type),
+    ('author', str, filter_by_author),
+    ('title', str, filter_by_title),
+]
+
 class BookPagination(PageNumberPagination):
+    """
+    Pagination that fetches the page rows and the total match count in a
+    single query, using COUNT(*) OVER () instead of a separate COUNT(*)
+    execution of the full filtered query.
+    """
     page_size = 25
     max_page_size = 100
     page_size_query_param = 'page_size'
 
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings:
+            # 'last' needs the count up front; fall back to the two-query path
+            page = super().paginate_queryset(queryset, request, view=view)
+            self.total_count = self.page.paginator.count
+            return page
+
+        try:
+            page_number = int(page_number)
+            if page_number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message='That page number is not valid.'
+            ))
+
+        offset = (page_number - 1) * page_size
+        rows = list(
+            queryset.annotate(_total=Window(expression=Count('pk')))[offset:offset + page_size]
+        )
+
+        if rows:
+            first = rows[0]
+            self.total_count = first['_total'] if isinstance(first, dict) else first._total
+        elif page_number == 1:
+            self.total_count = 0
+        else:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message='That page contains no results.'
+            ))
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Seed the cached count so the paginator never runs its own COUNT(*)
+        paginator.count = self.total_count
+        self.page = Page(rows, page_number, paginator)
+        self.request = request
+        return rows
+
+# Swagger schema objects for the list endpoint, built once at import time
+# and shared across requests rather than re-created per decorator call
+BOOK_LIST_PARAMETERS = [
+    openapi.Parameter(
+        'gutenberg_id',
+        openapi.IN_QUERY,
+        description="Filter by multiple Gutenberg IDs (comma-separated)",
+        type=openapi.TYPE_STRING,
+        example="1342,84,11"
+    ),
+    openapi.Parameter(
+        'language',
+        openapi.IN_QUERY,
+        description="Filter by language code(s) (comma-separated)",
+        type=openapi.TYPE_STRING,
+        example="en,fr"
+    ),
+    openapi.Parameter(
+        'topic',
+        openapi.IN_QUERY,
+        description="Filter by topic (subject or bookshelf) with case-insensitive partial matching (comma-separated)",
+        type=openapi.TYPE_STRING,
+        example="child,adventure"
+    ),
+    openapi.Parameter(
+        'mime_type',
+        openapi.IN_QUERY,
+        description="Filter by MIME-type (comma-separated)",
+        type=openapi.TYPE_STRING,
+        example="text/html,application/epub+zip"
+    ),
+    openapi.Parameter(
+        'author',
+        openapi.IN_QUERY,
+        description="Filter by author name with case-insensitive partial matching (comma-separated)",
+        type=openapi.TYPE_STRING,
+        example="twain,dickens"
+    ),
+    openapi.Parameter(
+        'title',
+        openapi.IN_QUERY,
+        description="Filter by title with case-insensitive partial matching (comma-separated)",
+        type=openapi.TYPE_STRING,
+        example="pride,adventure"
+    ),
+    openapi.Parameter(
+        'page',
+        openapi.IN_QUERY,
+        description="Page number for pagination",
+        type=openapi.TYPE_INTEGER,
+        default=1
+    ),
+    openapi.Parameter(
+        'page_size',
+        openapi.IN_QUERY,
+        description="Number of results per page (max 100)",
+        type=openapi.TYPE_INTEGER,
+        default=25
+    ),
+]
+
+BOOK_LIST_RESPONSES = {
+    200: openapi.Response(
+        description="Successfully retrieved list of books",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'count': openapi.Schema(type=openapi.TYPE_INTEGER, description="Number of books on current page"),
+                'count_total': openapi.Schema(type=openapi.TYPE_INTEGER, description="Total number of books matching criteria"),
+                'next': openapi.Schema(type=openapi.TYPE_STRING, description="URL for next page of results", nullable=True),
+                'previous': openapi.Schema(type=openapi.TYPE_STRING, description="URL for previous page of results", nullable=True),
+                'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT))
+            }
+        )
+    )
+}
+
 class BookListView(APIView):
     """
     API endpoint that allows books to be viewed.
-    
+
     Retrieves a list of books, ordered by download count (descending).
-    
+
     Can filter by:
     - gutenberg_id: Filter by multiple Gutenberg IDs, comma-separated
     - language: Filter by language code(s), comma-separated
@@ -33,211 +309,80 @@ class BookListView(APIView):
     - author: Filter by author name, comma-separated
     - title: Filter by title (case insensitive partial match), comma-separated
     """
-    
+
     @swagger_auto_schema(
-        manual_parameters=[
-            openapi.Parameter(
-                'gutenberg_id', 
-                openapi.IN_QUERY, 
-                description="Filter by multiple Gutenberg IDs (comma-separated)", 
-                type=openapi.TYPE_STRING,
-                example="1342,84,11"
-            ),
-            openapi.Parameter(
-                'language', 
-                openapi.IN_QUERY, 
-                description="Filter by language code(s) (comma-separated)", 
-                type=openapi.TYPE_STRING,
-                example="en,fr"
-            ),
-            openapi.Parameter(
-                'topic', 
-                openapi.IN_QUERY, 
-                description="Filter by topic (subject or bookshelf) with case-insensitive partial matching (comma-separated)", 
-                type=openapi.TYPE_STRING,
-                example="child,adventure"
-            ),
-            openapi.Parameter(
-                'mime_type', 
-                openapi.IN_QUERY, 
-                description="Filter by MIME-type (comma-separated)", 
-                type=openapi.TYPE_STRING,
-                example="text/html,application/epub+zip"
-            ),
-            openapi.Parameter(
-                'author', 
-                openapi.IN_QUERY, 
-                description="Filter by author name with case-insensitive partial matching (comma-separated)", 
-                type=openapi.TYPE_STRING,
-                example="twain,dickens"
-            ),
-            openapi.Parameter(
-                'title', 
-                openapi.IN_QUERY, 
-                description="Filter by title with case-insensitive partial matching (comma-separated)", 
-                type=openapi.TYPE_STRING,
-                example="pride,adventure"
-            ),
-            openapi.Parameter(
-                'page', 
-                openapi.IN_QUERY, 
-                description="Page number for pagination", 
-                type=openapi.TYPE_INTEGER,
-                default=1
-            ),
-            openapi.Parameter(
-                'page_size', 
-                openapi.IN_QUERY, 
-                description="Number of results per page (max 100)", 
-                type=openapi.TYPE_INTEGER,
-                default=25
-            ),
-        ],
-        responses={
-            200: openapi.Response(
-                description="Successfully retrieved list of books",
-                schema=openapi.Schema(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        'count': openapi.Schema(type=openapi.TYPE_INTEGER, description="Number of books on current page"),
-                        'count_total': openapi.Schema(type=openapi.TYPE_INTEGER, description="Total number of books matching criteria"),
-                        'next': openapi.Schema(type=openapi.TYPE_STRING, description="URL for next page of results", nullable=True),
-                        'previous': openapi.Schema(type=openapi.TYPE_STRING, description="URL for previous page of results", nullable=True),
-                        'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT))
-                    }
-                )
-            )
-        }
+        manual_parameters=BOOK_LIST_PARAMETERS,
+        responses=BOOK_LIST_RESPONSES
     )
     def get(self, request, format=None):
-        logger.info(f"Book list request received with params: {request.query_params}")
-        
-        # Start with the base queryset with prefetched related objects
-        queryset = BooksBook.objects.prefetch_related(
-            'authors', 
-            'languages', 
-            'subjects', 
-            'bookshelves', 
-            'booksformat_set'
-        ).order_by('-download_count')
+        logger.info("Book list request received with params: %s", request.query_params)
+
+        # Serve hot filter combinations straight from the cache
+        cache_key = book_list_cache_key(request.query_params)
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            logger.debug("Cache hit for key %s", cache_key)
+            return Response(cached_data)
+
+        # Start with the base queryset; related rows are fetched and
+        # grouped by build_book_payload after pagination
+        queryset = BooksBook.objects.order_by('-download_count')
         
         # Track applied filters
         applied_filters = []
-        
-        # Filter by gutenberg_id (multiple IDs, comma-separated)
-        gutenberg_ids = request.query_params.get('gutenberg_id')
-        if gutenberg_ids:
-            try:
-                ids = [int(x.strip()) for x in gutenberg_ids.split(',') if x.strip().isdigit()]
-                if ids:
-                    queryset = queryset.filter(gutenberg_id__in=ids)
-                    applied_filters.append(f"gutenberg_id: {ids}")
-                    logger.debug(f"Applied gutenberg_id filter: {ids}")
-            except Exception as e:
-                logger.error(f"Error applying gutenberg_id filter: {str(e)}")
-        
-        # Filter by language
-        languages = request.query_params.get('language')
-        if languages:
-            try:
-                language_codes = [x.strip().lower() for x in languages.split(',') if x.strip()]
-                if language_codes:
-                    queryset = queryset.filter(languages__code__in=language_codes)
-                    applied_filters.append(f"language: {language_codes}")
-                    logger.debug(f"Applied language filter: {language_codes}")
-            except Exception as e:
-                logger.error(f"Error applying language filter: {str(e)}")
-        
-        # Filter by topic (subject or bookshelf)
-        topics = request.query_params.get('topic')
-        if topics:
-            try:
-                topic_list = [x.strip() for x in topics.split(',') if x.strip()]
-                if topic_list:
-                    q_objects = Q()
-                    for topic in topic_list:
-                        q_objects |= Q(subjects__name__icontains=topic) | Q(bookshelves__name__icontains=topic)
-                    queryset = queryset.filter(q_objects).distinct()
-                    applied_filters.append(f"topic: {topic_list}")
-                    logger.debug(f"Applied topic filter: {topic_list}")
-            except Exception as e:
-                logger.error(f"Error applying topic filter: {str(e)}")
-        
-        # Filter by mime_type
-        mime_types = request.query_params.get('mime_type')
-        if mime_types:
-            try:
-                mime_type_list = [x.strip() for x in mime_types.split(',') if x.strip()]
-                if mime_type_list:
-                    queryset = queryset.filter(booksformat__mime_type__in=mime_type_list).distinct()
-                    applied_filters.append(f"mime_type: {mime_type_list}")
-                    logger.debug(f"Applied mime_type filter: {mime_type_list}")
-            except Exception as e:
-                logger.error(f"Error applying mime_type filter: {str(e)}")
-        
-        # Filter by author
-        authors = request.query_params.get('author')
-        if authors:
-            try:
-                author_list = [x.strip() for x in authors.split(',') if x.strip()]
-                if author_list:
-                    q_objects = Q()
-                    for author in author_list:
-                        q_objects |= Q(authors__name__icontains=author)
-                    queryset = queryset.filter(q_objects).distinct()
-                    applied_filters.append(f"author: {author_list}")
-                    logger.debug(f"Applied author filter: {author_list}")
-            except Exception as e:
-                logger.error(f"Error applying author filter: {str(e)}")
-        
-        # Filter by title
-        titles = request.query_params.get('title')
-        if titles:
+
+        # Apply each filter spec whose query param is present
+        for param, caster, apply_filter in FILTER_SPECS:
+            value = request.query_params.get(param)
+            if not value:
+                continue
             try:
-                title_list = [x.strip() for x in titles.split(',') if x.strip()]
-                if title_list:
-                    q_objects = Q()
-                    for title in title_list:
-                        q_objects |= Q(title__icontains=title)
-                    queryset = queryset.filter(q_objects).distinct()
-                    applied_filters.append(f"title: {title_list}")
-                    logger.debug(f"Applied title filter: {title_list}")
+                tokens = parse_csv_param(value, caster)
+                if tokens:
+                    queryset = apply_filter(queryset, tokens)
+                    applied_filters.append(f"{param}: {tokens}")
+                    logger.debug("Applied %s filter: %s", param, tokens)
             except Exception as e:
-                logger.error(f"Error applying title filter: {str(e)}")
-        
+                logger.error("Error applying %s filter: %s", param, e)
+
         # Log applied filters
         if applied_filters:
-            logger.info(f"Applied filters: {', '.join(applied_filters)}")
+            logger.info("Applied filters: %s", ', '.join(applied_filters))
         else:
             logger.info("No filters applied")
         
-        # Count total results before pagination
-        total_count = queryset.count()
-        logger.debug(f"Found {total_count} results")
-        
-        # Apply pagination
+        # Paginate the scalar book columns only; the total count comes
+        # back with the page rows
+        queryset = queryset.values('id', 'title', 'gutenberg_id', 'download_count')
         paginator = BookPagination()
         page = paginator.paginate_queryset(queryset, request)
-        
-        # Serialize results
+
+        # Assemble results
         if page is not None:
-            serializer = BookSerializer(page, many=True)
-            response = paginator.get_paginated_response(serializer.data)
+            total_count = paginator.total_count
+            logger.debug("Found %s results", total_count)
+
+            response = paginator.get_paginated_response(build_book_payload(page))
             response.data['count_total'] = total_count
-            
+            cache.set(cache_key, response.data, BOOK_LIST_CACHE_TTL)
+
             page_num = request.query_params.get('page', 1)
-            logger.info(f"Returned page {page_num} with {len(page)} results out of {total_count} total matches")
-            
+            logger.info("Returned page %s with %s results out of %s total matches", page_num, len(page), total_count)
+
             return response
-        
-        # If no pagination
-        serializer = BookSerializer(queryset, many=True)
-        logger.info(f"Returned all {total_count} results without pagination")
-        
-        return Response({
+
+        # If no pagination; iterate in chunks so the whole result set is
+        # never buffered by the driver at once
+        total_count = queryset.count()
+        rows = list(queryset.iterator(chunk_size=200))
+        logger.info("Returned all %s results without pagination", total_count)
+
+        data = {
             'count_total': total_count,
-            'results': serializer.data
-        })
+            'results': build_book_payload(rows)
+        }
+        cache.set(cache_key, data, BOOK_LIST_CACHE_TTL)
+        return Response(data)
 
 class BookDetailView(APIView):
     """
@@ -251,22 +396,14 @@ class BookDetailView(APIView):
         }
     )
     def get(self, request, pk, format=None):
-        logger.info(f"Book detail request received for book ID: {pk}")
-        
-        try:
-            book = get_object_or_404(BooksBook.objects.prefetch_related(
-                'authors', 
-                'languages', 
-                'subjects', 
-                'bookshelves', 
-                'booksformat_set'
-            ), pk=pk)
-            
-            serializer = BookSerializer(book)
-            
-            logger.info(f"Retrieved book: '{book.title or f'Book {book.id}'}' (ID: {book.id}, Gutenberg ID: {book.gutenberg_id})")
-            
-            return Response(serializer.data)
-        except Exception as e:
-            logger.error(f"Error retrieving book with ID {pk}: {str(e)}")
-            raise
+        logger.info("Book detail request received for book ID: %s", pk)
+
+        book = get_object_or_404(
+            BooksBook.objects.prefetch_related(*BOOK_PREFETCHES), pk=pk
+        )
+
+        serializer = BookSerializer(book)
+
+        logger.info("Retrieved book: '%s' (ID: %s, Gutenberg ID: %s)", book.title or f'Book {book.id}', book.id, book.gutenberg_id)
+
+        return Response(serializer.data)
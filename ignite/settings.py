@@ -32,6 +32,9 @@ DEBUG = os.environ.get('DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
 
+# Skip admin model registration for API-only deployments
+DISABLE_ADMIN = os.environ.get('DISABLE_ADMIN', 'False') == 'True'
+
 # CSRF Trusted Origins
 CSRF_TRUSTED_ORIGINS = os.environ.get('CSRF_TRUSTED_ORIGINS', 'https://ignite-production-d92d.up.railway.app,http://ignite-production-d92d.up.railway.app,http://localhost:8000').split(',')
 
@@ -107,16 +110,42 @@ DATABASES = {
         'PASSWORD': os.environ.get('DBPASSWORD'),
         'HOST': os.environ.get('DBHOST'),
         'PORT': os.environ.get('DBPORT'),
+        # Reuse connections across requests instead of paying TLS + auth
+        # per hit; health checks weed out stale connections on reuse
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'sslmode': os.environ.get('DBSSLMODE'),
         }
     }
 }
 
+# Cache
+# Redis when REDIS_URL is set (production); per-process local memory
+# otherwise so development works without a Redis instance
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 25,
+    'DEFAULT_RENDERER_CLASSES': [
+        'book.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 # Password validation